@@ -1,8 +1,53 @@
 """Example script demonstrating AI-Vision API usage."""
 
+import asyncio
+import sys
+import aiohttp
 import requests
-from datetime import datetime
+from requests.adapters import HTTPAdapter
+from requests_toolbelt import MultipartEncoder
+from urllib3.util.retry import Retry
+from datetime import datetime, timezone
 from pathlib import Path
+from typing import Iterable, List, Optional
+
+# RFC 3339 UTC timestamp, e.g. 2026-02-20T10:30:00.000000Z
+_TIMESTAMP_FORMAT = "%Y-%m-%dT%H:%M:%S.%fZ"
+
+
+def create_session(pool_maxsize: int = 16, retries: int = 3) -> requests.Session:
+    """
+    Create an HTTP session with connection pooling and retry with backoff.
+    
+    Connection failures are retried for every request. Transient 502/503/504
+    responses are only retried for idempotent methods: the streamed
+    /analyze upload body is consumed on the first attempt and cannot be
+    replayed.
+    
+    Args:
+        pool_maxsize: Maximum number of pooled connections per host
+        retries: Maximum number of retries per request
+        
+    Returns:
+        Configured requests.Session
+    """
+    adapter = HTTPAdapter(
+        pool_connections=4,
+        pool_maxsize=pool_maxsize,
+        max_retries=Retry(
+            total=retries,
+            backoff_factor=0.3,
+            status_forcelist=[502, 503, 504],
+        ),
+    )
+    session = requests.Session()
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+# Shared session so repeated calls reuse the pooled keep-alive connection
+_SESSION = create_session()
 
 
 def analyze_image_file(
@@ -10,7 +55,8 @@ def analyze_image_file(
     lat: float,
     lon: float,
     altitude: float = None,
-    api_url: str = "http://localhost:8000"
+    api_url: str = "http://localhost:8000",
+    session: Optional[requests.Session] = None,
 ) -> dict:
     """
     Analyze a sugarcane field image using the AI-Vision API.
@@ -21,6 +67,8 @@ def analyze_image_file(
         lon: Longitude in decimal degrees
         altitude: Altitude in meters (optional)
         api_url: Base URL of the API server
+        session: HTTP session to send the request with (defaults to a
+            module-level session shared across calls)
         
     Returns:
         Dictionary with analysis results
@@ -31,25 +79,22 @@ def analyze_image_file(
         raise FileNotFoundError(f"Image file not found: {image_path}")
     
     # Prepare form data
-    data = {
-        "image_id": image_file.name,
-        "lat": lat,
-        "lon": lon,
-        "timestamp": datetime.utcnow().isoformat() + "Z",
-    }
+    fields = _form_fields(image_file, lat, lon, altitude)
     
-    if altitude is not None:
-        data["altitude"] = altitude
-    
-    # Prepare files
-    with open(image_path, "rb") as f:
-        files = {"image": (image_file.name, f, "image/jpeg")}
+    # Unbuffered: each upload chunk is one read() straight into the chunk,
+    # with no intermediate BufferedReader copy
+    with open(image_path, "rb", buffering=0) as f:
+        fields["image"] = (image_file.name, f, "image/jpeg")
+        
+        # Stream the multipart body straight from disk instead of
+        # buffering the whole image in memory
+        encoder = MultipartEncoder(fields=fields)
         
         # Send POST request
-        response = requests.post(
+        response = (session or _SESSION).post(
             f"{api_url}/analyze",
-            data=data,
-            files=files,
+            data=encoder,
+            headers={"Content-Type": encoder.content_type},
             timeout=30,
         )
     
@@ -58,47 +103,125 @@ def analyze_image_file(
     return response.json()
 
 
+async def analyze_images_async(
+    image_paths: Iterable[str],
+    lat: float,
+    lon: float,
+    altitude: float = None,
+    api_url: str = "http://localhost:8000",
+    max_concurrency: int = 16,
+) -> List[dict]:
+    """
+    Analyze a batch of sugarcane field images concurrently.
+    
+    Requests are dispatched over one pooled aiohttp session, with at most
+    ``max_concurrency`` uploads in flight, so a directory of drone images
+    costs roughly one round trip per ``max_concurrency`` images instead of
+    one per image.
+    
+    Args:
+        image_paths: Paths to image files (JPEG or PNG)
+        lat: Latitude in decimal degrees
+        lon: Longitude in decimal degrees
+        altitude: Altitude in meters (optional)
+        api_url: Base URL of the API server
+        max_concurrency: Maximum number of requests in flight
+        
+    Returns:
+        List of analysis results, in the same order as ``image_paths``
+    """
+    image_files = [Path(image_path) for image_path in image_paths]
+    for image_file in image_files:
+        if not image_file.exists():
+            raise FileNotFoundError(f"Image file not found: {image_file}")
+    
+    semaphore = asyncio.Semaphore(max_concurrency)
+    connector = aiohttp.TCPConnector(limit=max_concurrency)
+    timeout = aiohttp.ClientTimeout(total=30)
+    
+    async def post_image(session: aiohttp.ClientSession, image_file: Path) -> dict:
+        async with semaphore:
+            # Read off the event loop so disk I/O doesn't stall other uploads
+            image_bytes = await asyncio.to_thread(image_file.read_bytes)
+            
+            form = aiohttp.FormData()
+            for name, value in _form_fields(image_file, lat, lon, altitude).items():
+                form.add_field(name, value)
+            form.add_field("image", image_bytes, filename=image_file.name, content_type="image/jpeg")
+            
+            async with session.post(f"{api_url}/analyze", data=form) as response:
+                response.raise_for_status()
+                return await response.json()
+    
+    async with aiohttp.ClientSession(connector=connector, timeout=timeout) as session:
+        return await asyncio.gather(*(post_image(session, f) for f in image_files))
+
+
+def _form_fields(
+    image_file: Path,
+    lat: float,
+    lon: float,
+    altitude: Optional[float],
+) -> dict:
+    """Build the /analyze form fields for an image (multipart fields must be strings)."""
+    fields = {
+        "image_id": image_file.name,
+        "lat": str(lat),
+        "lon": str(lon),
+        "timestamp": datetime.now(timezone.utc).strftime(_TIMESTAMP_FORMAT),
+    }
+    
+    if altitude is not None:
+        fields["altitude"] = str(altitude)
+    
+    return fields
+
+
 def print_analysis_results(results: dict) -> None:
     """Pretty print analysis results."""
-    print("\n" + "="*60)
-    print("AI-VISION ANALYSIS RESULTS")
-    print("="*60)
+    # Build the whole report and emit it with a single write
+    parts: List[str] = []
+    parts.append("\n" + "="*60 + "\n")
+    parts.append("AI-VISION ANALYSIS RESULTS\n")
+    parts.append("="*60 + "\n")
     
-    print(f"\n📍 Image: {results['image_id']}")
-    print(f"📍 GPS: ({results['gps']['lat']:.6f}, {results['gps']['lon']:.6f})")
+    parts.append(f"\n📍 Image: {results['image_id']}\n")
+    parts.append(f"📍 GPS: ({results['gps']['lat']:.6f}, {results['gps']['lon']:.6f})\n")
     if results['gps'].get('altitude'):
-        print(f"📍 Altitude: {results['gps']['altitude']:.1f}m")
-    print(f"📍 Timestamp: {results['timestamp']}")
+        parts.append(f"📍 Altitude: {results['gps']['altitude']:.1f}m\n")
+    parts.append(f"📍 Timestamp: {results['timestamp']}\n")
     
-    print(f"\n🌱 MATURITY ANALYSIS")
+    parts.append(f"\n🌱 MATURITY ANALYSIS\n")
     maturity = results['maturity']
-    print(f"   Level: {maturity['level'].replace('_', ' ').title()}")
-    print(f"   Confidence: {maturity['confidence']:.1%}")
-    print(f"   Estimated ATR: {maturity['estimated_atr']:.1f} kg/ton")
+    parts.append(f"   Level: {maturity['level'].replace('_', ' ').title()}\n")
+    parts.append(f"   Confidence: {maturity['confidence']:.1%}\n")
+    parts.append(f"   Estimated ATR: {maturity['estimated_atr']:.1f} kg/ton\n")
     if maturity.get('estimated_pol'):
-        print(f"   Estimated POL: {maturity['estimated_pol']:.1f}%")
+        parts.append(f"   Estimated POL: {maturity['estimated_pol']:.1f}%\n")
     if maturity.get('estimated_brix'):
-        print(f"   Estimated Brix: {maturity['estimated_brix']:.1f}%")
+        parts.append(f"   Estimated Brix: {maturity['estimated_brix']:.1f}%\n")
     
     if results['pests']:
-        print(f"\n🐛 PEST DETECTIONS ({len(results['pests'])})")
+        parts.append(f"\n🐛 PEST DETECTIONS ({len(results['pests'])})\n")
         for pest in results['pests']:
-            print(f"   - {pest['pest_type']}: {pest['severity']} severity ({pest['confidence']:.1%} confidence)")
+            parts.append(f"   - {pest['pest_type']}: {pest['severity']} severity ({pest['confidence']:.1%} confidence)\n")
     else:
-        print(f"\n🐛 PEST DETECTIONS: None")
+        parts.append(f"\n🐛 PEST DETECTIONS: None\n")
     
     if results['diseases']:
-        print(f"\n🦠 DISEASE DETECTIONS ({len(results['diseases'])})")
+        parts.append(f"\n🦠 DISEASE DETECTIONS ({len(results['diseases'])})\n")
         for disease in results['diseases']:
-            print(f"   - {disease['disease_type']}: {disease['severity']} severity ({disease['confidence']:.1%} confidence)")
+            parts.append(f"   - {disease['disease_type']}: {disease['severity']} severity ({disease['confidence']:.1%} confidence)\n")
             if disease.get('affected_area_pct'):
-                print(f"     Affected area: {disease['affected_area_pct']:.1f}%")
+                parts.append(f"     Affected area: {disease['affected_area_pct']:.1f}%\n")
     else:
-        print(f"\n🦠 DISEASE DETECTIONS: None")
+        parts.append(f"\n🦠 DISEASE DETECTIONS: None\n")
+    
+    parts.append(f"\n⏱️  Processing time: {results['processing_time_ms']:.1f}ms\n")
+    parts.append(f"🤖 Model version: {results['model_version']}\n")
+    parts.append("="*60 + "\n\n")
     
-    print(f"\n⏱️  Processing time: {results['processing_time_ms']:.1f}ms")
-    print(f"🤖 Model version: {results['model_version']}")
-    print("="*60 + "\n")
+    sys.stdout.write("".join(parts))
 
 
 def main():
@@ -113,6 +236,8 @@ def main():
     img = Image.new('RGB', (640, 480), color=(34, 139, 34))  # Forest green
     img.save(test_image_path, 'JPEG')
     
+    session = create_session()
+    
     try:
         # Analyze the test image
         # GPS coordinates for São Paulo sugarcane region
@@ -121,13 +246,26 @@ def main():
             lat=-21.1234,
             lon=-47.5678,
             altitude=580.0,
-            api_url="http://localhost:8000"
+            api_url="http://localhost:8000",
+            session=session,
         )
         
         # Print results
         print_analysis_results(results)
         
-    except requests.exceptions.ConnectionError:
+        # Example 2: Analyze a batch of images concurrently
+        print("Example 2: Analyzing a batch of images concurrently...")
+        batch_results = asyncio.run(analyze_images_async(
+            image_paths=[test_image_path] * 4,
+            lat=-21.1234,
+            lon=-47.5678,
+            altitude=580.0,
+            api_url="http://localhost:8000",
+        ))
+        for batch_result in batch_results:
+            print(f"   - {batch_result['image_id']}: {batch_result['maturity']['level']}")
+        
+    except (requests.exceptions.ConnectionError, aiohttp.ClientConnectionError):
         print("\n❌ Error: Could not connect to API server.")
         print("   Make sure the server is running:")
         print("   python -m uvicorn src.api:app --reload")
@@ -136,10 +274,15 @@ def main():
         print(f"\n❌ HTTP Error: {e}")
         print(f"   Response: {e.response.text}")
         
+    except aiohttp.ClientResponseError as e:
+        print(f"\n❌ HTTP Error: {e.status} {e.message}")
+        
     except Exception as e:
         print(f"\n❌ Error: {e}")
     
     finally:
+        session.close()
+        
         # Clean up test image
         import os
         if os.path.exists(test_image_path):
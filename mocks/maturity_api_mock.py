@@ -5,22 +5,141 @@ AI-Vision-Agriculture - Maturity API Mock
 API REST para fornecer dados de maturidade para CanaSwarm-Intelligence
 """
 
-import json
+import hashlib
+from email.utils import formatdate
+from operator import itemgetter
 from pathlib import Path
-from flask import Flask, jsonify, request
 
-app = Flask(__name__)
+import orjson
+from aiohttp import web
+from aiohttp.web_request import ETAG_ANY
 
 # Carrega dados de exemplo
 DATA_FILE = Path(__file__).parent / "example_field_images.json"
 
-with open(DATA_FILE, 'r', encoding='utf-8') as f:
-    ANALYSIS_DATA = json.load(f)
+ANALYSIS_DATA = orjson.loads(DATA_FILE.read_bytes())
 
+# Cabeçalhos de cache HTTP: os dados só mudam quando o arquivo muda
+# (datas HTTP têm resolução de 1 segundo)
+DATA_MTIME = int(DATA_FILE.stat().st_mtime)
+CACHE_HEADERS = {
+    'Last-Modified': formatdate(DATA_MTIME, usegmt=True),
+    'Cache-Control': 'public, max-age=60',
+}
 
-@app.route('/')
-def home():
-    return jsonify({
+# Índice de talhões por field_id (busca O(1) por requisição)
+FIELDS_BY_ID = {field['field_id']: field for field in ANALYSIS_DATA['fields']}
+
+
+# Prioridade de colheita por nível de maturidade: (prioridade, rótulo)
+LEVEL_TO_PRIORITY = {
+    'optimal': (1, 'ALTA'),
+    'mature': (2, 'MÉDIA'),
+    'developing': (3, 'BAIXA'),
+}
+DEFAULT_PRIORITY = (4, 'AGUARDAR')
+
+
+def _priority_entry(field: dict) -> dict:
+    """Monta a entrada de prioridade de colheita de um talhão"""
+    analysis = field['analysis']
+    priority, priority_label = LEVEL_TO_PRIORITY.get(analysis['maturity_level'], DEFAULT_PRIORITY)
+    
+    return {
+        'field_id': field['field_id'],
+        'field_name': field['field_name'],
+        'area_ha': field['area_ha'],
+        'maturity_score': analysis['maturity_score'],
+        'maturity_level': analysis['maturity_level'],
+        'sugar_content_percent': analysis['estimated_sugar_content_percent'],
+        'harvest_recommendation': analysis['harvest_recommendation'],
+        'priority': priority,
+        'priority_label': priority_label
+    }
+
+
+def build_harvest_priority() -> dict:
+    """Calcula a lista de talhões ordenada por prioridade de colheita"""
+    fields_priority = [_priority_entry(field) for field in ANALYSIS_DATA['fields']]
+    
+    # Ordena por prioridade
+    fields_priority.sort(key=itemgetter('priority'))
+    
+    return {
+        'analysis_id': ANALYSIS_DATA['analysis_id'],
+        'total_fields': len(fields_priority),
+        'fields': fields_priority
+    }
+
+
+def build_maturity(field_data: dict) -> dict:
+    """Monta a resposta de análise de maturidade de um talhão"""
+    return {
+        'analysis_id': ANALYSIS_DATA['analysis_id'],
+        'analysis_date': ANALYSIS_DATA['analysis_date'],
+        'field_id': field_data['field_id'],
+        'field_name': field_data['field_name'],
+        'area_ha': field_data['area_ha'],
+        'crop': field_data['crop'],
+        'harvest_number': field_data['harvest_number'],
+        'maturity': field_data['analysis'],
+        'indices': field_data['indices'],
+        'zones': field_data.get('zones_analysis', []),
+        'recommendations': field_data.get('recommendations', [])
+    }
+
+
+def serialize(payload: dict) -> tuple:
+    """Serializa a resposta uma única vez, retornando (corpo, ETag sem aspas)"""
+    body = orjson.dumps(payload)
+    return body, hashlib.md5(body).hexdigest()
+
+
+def json_response(payload: dict, status: int = 200) -> web.Response:
+    """Serializa a resposta com orjson"""
+    return web.Response(
+        body=orjson.dumps(payload),
+        status=status,
+        content_type='application/json',
+        charset='utf-8',
+    )
+
+
+def cached_json_response(request: web.Request, body: bytes, etag: str) -> web.Response:
+    """Retorna o corpo pré-serializado, ou 304 se o cliente já possui essa versão"""
+    headers = {'ETag': f'"{etag}"', **CACHE_HEADERS}
+    
+    # If-None-Match tem precedência sobre If-Modified-Since (RFC 7232);
+    # aceita listas, "*" e validadores fracos (comparação fraca)
+    if_none_match = request.if_none_match
+    if if_none_match is not None:
+        not_modified = any(tag.value in (etag, ETAG_ANY) for tag in if_none_match)
+    else:
+        if_modified_since = request.if_modified_since
+        not_modified = if_modified_since is not None and if_modified_since.timestamp() >= DATA_MTIME
+    
+    if not_modified:
+        return web.Response(status=304, headers=headers)
+    
+    return web.Response(
+        body=body,
+        content_type='application/json',
+        charset='utf-8',
+        headers=headers,
+    )
+
+
+# Dados estáticos: as respostas são calculadas e serializadas uma única vez na importação
+HARVEST_PRIORITY = build_harvest_priority()
+HARVEST_PRIORITY_BODY = serialize(HARVEST_PRIORITY)
+MATURITY_BODIES = {
+    field_id: serialize(build_maturity(field))
+    for field_id, field in FIELDS_BY_ID.items()
+}
+
+
+async def home(request: web.Request) -> web.Response:
+    return json_response({
         'service': 'AI-Vision-Agriculture API',
         'version': '1.0.0-mock',
         'status': 'running',
@@ -32,96 +151,49 @@ def home():
     })
 
 
-@app.route('/health')
-def health():
-    return jsonify({'status': 'healthy', 'timestamp': '2026-02-20T14:00:00Z'})
+async def health(request: web.Request) -> web.Response:
+    return json_response({'status': 'healthy', 'timestamp': '2026-02-20T14:00:00Z'})
 
 
-@app.route('/api/v1/maturity', methods=['GET'])
-def get_maturity():
+async def get_maturity(request: web.Request) -> web.Response:
     """
     Retorna análise de maturidade para um talhão
     
     Query params:
         field_id: ID do talhão (ex: F001)
     """
-    field_id = request.args.get('field_id')
+    field_id = request.query.get('field_id')
     
     if not field_id:
-        return jsonify({'error': 'field_id é obrigatório'}), 400
+        return json_response({'error': 'field_id é obrigatório'}, status=400)
     
     # Busca talhão
-    field_data = None
-    for field in ANALYSIS_DATA['fields']:
-        if field['field_id'] == field_id:
-            field_data = field
-            break
+    cached = MATURITY_BODIES.get(field_id)
     
-    if not field_data:
-        return jsonify({'error': f'Talhão {field_id} não encontrado'}), 404
+    if not cached:
+        return json_response({'error': f'Talhão {field_id} não encontrado'}, status=404)
     
-    # Retorna análise
-    response = {
-        'analysis_id': ANALYSIS_DATA['analysis_id'],
-        'analysis_date': ANALYSIS_DATA['analysis_date'],
-        'field_id': field_data['field_id'],
-        'field_name': field_data['field_name'],
-        'area_ha': field_data['area_ha'],
-        'crop': field_data['crop'],
-        'harvest_number': field_data['harvest_number'],
-        'maturity': field_data['analysis'],
-        'indices': field_data['indices'],
-        'zones': field_data.get('zones_analysis', []),
-        'recommendations': field_data.get('recommendations', [])
-    }
-    
-    return jsonify(response)
+    return cached_json_response(request, *cached)
 
 
-@app.route('/api/v1/harvest-priority', methods=['GET'])
-def get_harvest_priority():
+async def get_harvest_priority(request: web.Request) -> web.Response:
     """
     Retorna lista de talhões ordenada por prioridade de colheita
     """
-    fields_priority = []
-    
-    for field in ANALYSIS_DATA['fields']:
-        analysis = field['analysis']
-        
-        # Calcula prioridade
-        if analysis['maturity_level'] == 'optimal':
-            priority = 1
-            priority_label = 'ALTA'
-        elif analysis['maturity_level'] == 'mature':
-            priority = 2
-            priority_label = 'MÉDIA'
-        elif analysis['maturity_level'] == 'developing':
-            priority = 3
-            priority_label = 'BAIXA'
-        else:
-            priority = 4
-            priority_label = 'AGUARDAR'
-        
-        fields_priority.append({
-            'field_id': field['field_id'],
-            'field_name': field['field_name'],
-            'area_ha': field['area_ha'],
-            'maturity_score': analysis['maturity_score'],
-            'maturity_level': analysis['maturity_level'],
-            'sugar_content_percent': analysis['estimated_sugar_content_percent'],
-            'harvest_recommendation': analysis['harvest_recommendation'],
-            'priority': priority,
-            'priority_label': priority_label
-        })
-    
-    # Ordena por prioridade
-    fields_priority.sort(key=lambda x: x['priority'])
-    
-    return jsonify({
-        'analysis_id': ANALYSIS_DATA['analysis_id'],
-        'total_fields': len(fields_priority),
-        'fields': fields_priority
-    })
+    return cached_json_response(request, *HARVEST_PRIORITY_BODY)
+
+
+def create_app() -> web.Application:
+    """Cria a aplicação aiohttp com as rotas do mock"""
+    app = web.Application()
+    app.router.add_get('/', home)
+    app.router.add_get('/health', health)
+    app.router.add_get('/api/v1/maturity', get_maturity)
+    app.router.add_get('/api/v1/harvest-priority', get_harvest_priority)
+    return app
+
+
+app = create_app()
 
 
 if __name__ == '__main__':
@@ -134,4 +206,4 @@ if __name__ == '__main__':
     print("   GET /health")
     print("\n✅ Pronto para receber requisições do CanaSwarm-Intelligence\n")
     
-    app.run(host='0.0.0.0', port=5001, debug=True)
+    web.run_app(app, host='0.0.0.0', port=5001)
@@ -5,11 +5,36 @@ AI-Vision-Agriculture - Vision Analyzer Mock
 Analisa imagens de satélite/drone para determinar maturidade de cana-de-açúcar
 """
 
-import json
+import functools
 import random
+import sys
 from pathlib import Path
 from typing import Dict, List
 
+import numpy as np
+import orjson
+
+# Limiares de NDVI que separam as faixas de maturidade (limite inferior exclusivo)
+NDVI_THRESHOLDS = np.array([0.5, 0.6, 0.7])
+
+# Faixas indexadas por np.searchsorted(NDVI_THRESHOLDS, ndvi_avg):
+# (maturity_score, maturity_level, harvest_recommendation)
+MATURITY_BUCKETS = (
+    (0.30, "immature", "wait_60_days"),
+    (0.50, "developing", "wait_30_days"),
+    (0.70, "mature", "ready_in_3_weeks"),
+    (0.85, "optimal", "ready_in_2_weeks"),
+)
+
+# Pontuação de prioridade de colheita por nível de maturidade (demais níveis: 0)
+LEVEL_TO_PRIORITY = {'optimal': 10, 'mature': 7, 'developing': 3, 'immature': 0}
+
+
+@functools.lru_cache(maxsize=8)
+def _load_cached(path: str, mtime_ns: int) -> Dict:
+    """Lê e decodifica o JSON de análise; o mtime na chave invalida o cache se o arquivo mudar"""
+    return orjson.loads(Path(path).read_bytes())
+
 
 class VisionAnalyzer:
     """Analisador de imagens para agricultura de precisão"""
@@ -21,8 +46,8 @@ class VisionAnalyzer:
         """Carrega análise de arquivo JSON"""
         print(f"📷 Carregando análise de imagens: {filepath}")
         
-        with open(filepath, 'r', encoding='utf-8') as f:
-            self.analysis_data = json.load(f)
+        # Dados compartilhados entre instâncias: tratar como somente leitura
+        self.analysis_data = _load_cached(filepath, Path(filepath).stat().st_mtime_ns)
         
         print(f"✅ Análise carregada: {self.analysis_data['analysis_id']}")
         print(f"   Data da análise: {self.analysis_data['analysis_date']}")
@@ -44,23 +69,9 @@ class VisionAnalyzer:
         ndvi_avg = field_data['indices']['ndvi_avg']
         harvest_number = field_data['harvest_number']
         
-        # Lógica simplificada
-        if ndvi_avg > 0.7:
-            maturity_score = 0.85
-            maturity_level = "optimal"
-            harvest_rec = "ready_in_2_weeks"
-        elif ndvi_avg > 0.6:
-            maturity_score = 0.70
-            maturity_level = "mature"
-            harvest_rec = "ready_in_3_weeks"
-        elif ndvi_avg > 0.5:
-            maturity_score = 0.50
-            maturity_level = "developing"
-            harvest_rec = "wait_30_days"
-        else:
-            maturity_score = 0.30
-            maturity_level = "immature"
-            harvest_rec = "wait_60_days"
+        # Lógica simplificada: faixa de NDVI por busca binária, sem cadeia de if/elif
+        bucket = int(np.searchsorted(NDVI_THRESHOLDS, ndvi_avg))
+        maturity_score, maturity_level, harvest_rec = MATURITY_BUCKETS[bucket]
         
         return {
             'maturity_score': maturity_score,
@@ -75,21 +86,24 @@ class VisionAnalyzer:
         if not self.analysis_data:
             return []
         
+        fields = self.analysis_data['fields']
+        
+        # Calcula pontuação de prioridade
+        priorities = np.fromiter(
+            (LEVEL_TO_PRIORITY.get(field['analysis']['maturity_level'], 0) for field in fields),
+            dtype=np.int8,
+            count=len(fields),
+        )
+        
+        # Ordena por prioridade (maior primeiro, mantendo a ordem original nos empates)
+        order = np.argsort(-priorities, kind='stable')
+        
         fields_with_priority = []
         
-        for field in self.analysis_data['fields']:
+        for i in order:
+            field = fields[i]
             analysis = field['analysis']
             
-            # Calcula pontuação de prioridade
-            if analysis['maturity_level'] == 'optimal':
-                priority_score = 10
-            elif analysis['maturity_level'] == 'mature':
-                priority_score = 7
-            elif analysis['maturity_level'] == 'developing':
-                priority_score = 3
-            else:
-                priority_score = 0
-            
             fields_with_priority.append({
                 'field_id': field['field_id'],
                 'field_name': field['field_name'],
@@ -98,13 +112,10 @@ class VisionAnalyzer:
                 'maturity_level': analysis['maturity_level'],
                 'harvest_recommendation': analysis['harvest_recommendation'],
                 'sugar_content_percent': analysis['estimated_sugar_content_percent'],
-                'priority_score': priority_score,
+                'priority_score': int(priorities[i]),
                 'zones_count': len(field.get('zones_analysis', []))
             })
         
-        # Ordena por prioridade (maior primeiro)
-        fields_with_priority.sort(key=lambda x: x['priority_score'], reverse=True)
-        
         return fields_with_priority
     
     def print_analysis_summary(self):
@@ -113,38 +124,42 @@ class VisionAnalyzer:
             print("❌ Nenhuma análise carregada")
             return
         
-        print("\n" + "="*60)
-        print("📊 RESUMO DA ANÁLISE DE IMAGENS")
-        print("="*60)
+        # Monta a saída completa e escreve de uma vez (uma única escrita no stdout)
+        parts: List[str] = []
+        parts.append("\n" + "="*60 + "\n")
+        parts.append("📊 RESUMO DA ANÁLISE DE IMAGENS\n")
+        parts.append("="*60 + "\n")
         
         meta = self.analysis_data['metadata']
-        print(f"\n📷 Análise ID: {self.analysis_data['analysis_id']}")
-        print(f"   Fonte: {self.analysis_data['image_source']}")
-        print(f"   Confiança média: {meta['avg_confidence']:.2%}")
+        parts.append(f"\n📷 Análise ID: {self.analysis_data['analysis_id']}\n")
+        parts.append(f"   Fonte: {self.analysis_data['image_source']}\n")
+        parts.append(f"   Confiança média: {meta['avg_confidence']:.2%}\n")
         
-        print(f"\n📊 ESTATÍSTICAS:")
-        print(f"   Talhões analisados: {meta['total_fields_analyzed']}")
-        print(f"   Área total: {meta['total_area_ha']} ha")
-        print(f"   Prontos para colheita: {meta['fields_ready_harvest']}")
-        print(f"   Em desenvolvimento: {meta['fields_developing']}")
+        parts.append(f"\n📊 ESTATÍSTICAS:\n")
+        parts.append(f"   Talhões analisados: {meta['total_fields_analyzed']}\n")
+        parts.append(f"   Área total: {meta['total_area_ha']} ha\n")
+        parts.append(f"   Prontos para colheita: {meta['fields_ready_harvest']}\n")
+        parts.append(f"   Em desenvolvimento: {meta['fields_developing']}\n")
         
-        print(f"\n🌾 TALHÕES EM DETALHE:")
+        parts.append(f"\n🌾 TALHÕES EM DETALHE:\n")
         for field in self.analysis_data['fields']:
             analysis = field['analysis']
             
             status_icon = "🟢" if analysis['maturity_level'] in ['optimal', 'mature'] else "🟡"
             
-            print(f"\n{status_icon} {field['field_name']} ({field['field_id']})")
-            print(f"   Área: {field['area_ha']} ha | Corte: {field['harvest_number']}")
-            print(f"   Maturidade: {analysis['maturity_score']:.2f} ({analysis['maturity_level']})")
-            print(f"   Açúcar estimado: {analysis['estimated_sugar_content_percent']:.1f}%")
-            print(f"   NDVI médio: {field['indices']['ndvi_avg']:.2f}")
-            print(f"   Recomendação: {analysis['harvest_recommendation'].replace('_', ' ').upper()}")
+            parts.append(f"\n{status_icon} {field['field_name']} ({field['field_id']})\n")
+            parts.append(f"   Área: {field['area_ha']} ha | Corte: {field['harvest_number']}\n")
+            parts.append(f"   Maturidade: {analysis['maturity_score']:.2f} ({analysis['maturity_level']})\n")
+            parts.append(f"   Açúcar estimado: {analysis['estimated_sugar_content_percent']:.1f}%\n")
+            parts.append(f"   NDVI médio: {field['indices']['ndvi_avg']:.2f}\n")
+            parts.append(f"   Recomendação: {analysis['harvest_recommendation'].replace('_', ' ').upper()}\n")
             
             if 'zones_analysis' in field and field['zones_analysis']:
-                print(f"   Zonas analisadas: {len(field['zones_analysis'])}")
+                parts.append(f"   Zonas analisadas: {len(field['zones_analysis'])}\n")
                 for zone in field['zones_analysis']:
-                    print(f"      • {zone['zone_id']}: maturidade {zone['maturity_score']:.2f} ({zone['maturity_level']})")
+                    parts.append(f"      • {zone['zone_id']}: maturidade {zone['maturity_score']:.2f} ({zone['maturity_level']})\n")
+        
+        sys.stdout.write(''.join(parts))
 
 
 if __name__ == "__main__":
@@ -3,8 +3,10 @@
 from .models import (
     GPSCoordinates,
     MaturityAnalysis,
+    MaturityLevel,
     PestDetection,
     DiseaseDetection,
+    Severity,
     VisionAnalysisRequest,
     VisionAnalysisResponse,
 )
@@ -17,8 +19,10 @@ __all__ = [
     "VisionAnalyzer",
     "GPSCoordinates",
     "MaturityAnalysis",
+    "MaturityLevel",
     "PestDetection",
     "DiseaseDetection",
+    "Severity",
     "VisionAnalysisRequest",
     "VisionAnalysisResponse",
 ]
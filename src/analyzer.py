@@ -1,21 +1,64 @@
 """Vision analyzer - placeholder implementation with mock results."""
 
-import random
 import time
 from datetime import datetime
 from io import BytesIO
-from typing import List, Tuple
+from typing import List, Optional, Sequence, Tuple
 
+import numpy as np
 from PIL import Image
 
 from .models import (
     GPSCoordinates,
     MaturityAnalysis,
+    MaturityLevel,
     PestDetection,
     DiseaseDetection,
+    Severity,
     VisionAnalysisResponse,
 )
 
+try:
+    from turbojpeg import TJPF_RGB, TurboJPEG
+except ImportError:  # PyTurboJPEG is optional; Pillow decodes JPEGs otherwise
+    TurboJPEG = None
+
+try:
+    import cv2
+except ImportError:  # OpenCV is optional; Pillow decodes PNGs otherwise
+    cv2 = None
+
+
+def _create_turbojpeg():
+    """
+    Create a libjpeg-turbo decoder.
+    
+    Returns:
+        TurboJPEG instance, or None if PyTurboJPEG or the libturbojpeg
+        shared library is not available
+    """
+    if TurboJPEG is None:
+        return None
+    try:
+        return TurboJPEG()
+    except (OSError, RuntimeError):
+        return None
+
+
+def _to_rgb_array(image: Image.Image) -> np.ndarray:
+    """
+    Load a PIL image as an RGB pixel array.
+    
+    Args:
+        image: PIL Image object
+        
+    Returns:
+        uint8 array of shape (height, width, 3)
+    """
+    if image.mode != "RGB":
+        image = image.convert("RGB")
+    return np.asarray(image)
+
 
 class VisionAnalyzer:
     """
@@ -25,6 +68,36 @@ class VisionAnalyzer:
     In production, this would load an ML model and perform actual inference.
     """
     
+    _ALLOWED_FORMATS = frozenset({"JPEG", "PNG"})
+    _MIN_SIZE = 224
+    _MAX_SIZE = 4096
+    _PREVIEW_SIZE = (512, 512)
+    
+    # Mock maturity levels: (level, base ATR, base POL, base Brix)
+    _LEVELS = (
+        (MaturityLevel.IMMATURE, 10.5, 12.0, 14.0),
+        (MaturityLevel.EARLY_MATURITY, 12.5, 14.5, 16.0),
+        (MaturityLevel.READY_TO_HARVEST, 14.0, 16.5, 18.5),
+        (MaturityLevel.LATE_HARVEST, 13.5, 15.8, 17.8),
+        (MaturityLevel.OVERRIPE, 12.0, 14.0, 16.5),
+    )
+    # Cumulative selection weights for _LEVELS (favor ready_to_harvest)
+    _CUM_WEIGHTS = np.cumsum([0.1, 0.15, 0.5, 0.15, 0.1])
+    
+    # Mock detections: (type, severity)
+    _PEST_TYPES = (
+        ("sugarcane_borer", Severity.MODERATE),
+        ("spittlebug", Severity.LOW),
+        ("white_grub", Severity.MODERATE),
+        ("aphid", Severity.LOW),
+    )
+    _DISEASE_TYPES = (
+        ("red_rot", Severity.HIGH),
+        ("smut", Severity.MODERATE),
+        ("rust", Severity.LOW),
+        ("mosaic_virus", Severity.MODERATE),
+    )
+    
     def __init__(self, model_version: str = "placeholder-v0.1"):
         """
         Initialize the vision analyzer.
@@ -33,6 +106,7 @@ class VisionAnalyzer:
             model_version: Version identifier for the analysis model
         """
         self.model_version = model_version
+        self._turbojpeg = _create_turbojpeg()
         self._initialized = True
         
     def analyze_image(
@@ -59,24 +133,39 @@ class VisionAnalyzer:
         # Validate image
         self._validate_image(image)
         
-        # Generate mock analysis results
-        maturity = self._analyze_maturity(image, gps)
-        pests = self._detect_pests(image)
-        diseases = self._detect_diseases(image)
+        pixels = _to_rgb_array(image)
+        return self._run_analysis(pixels, image.size, image_id, gps, timestamp, start_time)
+    
+    def analyze_image_array(
+        self,
+        pixels: np.ndarray,
+        image_id: str,
+        gps: GPSCoordinates,
+        timestamp: datetime,
+    ) -> VisionAnalysisResponse:
+        """
+        Analyze an already decoded sugarcane field image.
         
-        # Calculate processing time
-        processing_time_ms = (time.time() - start_time) * 1000
+        Args:
+            pixels: RGB pixel array of shape (height, width, 3)
+            image_id: Unique identifier for the image
+            gps: GPS coordinates where image was captured
+            timestamp: Timestamp when image was captured
+            
+        Returns:
+            VisionAnalysisResponse with analysis results
+            
+        Raises:
+            ValueError: If the array is not an RGB image of valid size
+        """
+        start_time = time.time()
         
-        return VisionAnalysisResponse(
-            image_id=image_id,
-            gps=gps,
-            timestamp=timestamp,
-            maturity=maturity,
-            pests=pests,
-            diseases=diseases,
-            processing_time_ms=processing_time_ms,
-            model_version=self.model_version,
-        )
+        if pixels.ndim != 3 or pixels.shape[2] != 3:
+            raise ValueError(f"Expected an RGB array of shape (height, width, 3), got {pixels.shape}.")
+        height, width = pixels.shape[:2]
+        self._validate_size(width, height)
+        
+        return self._run_analysis(pixels, (width, height), image_id, gps, timestamp, start_time)
     
     def analyze_image_bytes(
         self,
@@ -84,6 +173,7 @@ class VisionAnalyzer:
         image_id: str,
         gps: GPSCoordinates,
         timestamp: datetime,
+        image_format: Optional[str] = None,
     ) -> VisionAnalysisResponse:
         """
         Analyze sugarcane field image from bytes.
@@ -93,12 +183,231 @@ class VisionAnalyzer:
             image_id: Unique identifier for the image
             gps: GPS coordinates where image was captured
             timestamp: Timestamp when image was captured
+            image_format: Format already detected by the caller ("JPEG" or
+                "PNG"), or None to detect it from the data
+            
+        Returns:
+            VisionAnalysisResponse with analysis results
+        """
+        start_time = time.time()
+        
+        pixels, size = self.decode_image_bytes(image_bytes, image_format)
+        
+        return self._run_analysis(pixels, size, image_id, gps, timestamp, start_time)
+    
+    def decode_image_bytes(
+        self,
+        image_bytes: bytes,
+        image_format: Optional[str] = None,
+    ) -> Tuple[np.ndarray, Tuple[int, int]]:
+        """
+        Validate and decode image bytes straight to an RGB pixel array.
+        
+        Format and dimensions are checked from the header before any pixel
+        data is decoded. JPEGs are decoded at reduced scale: libjpeg
+        DCT-scales the image down towards ``_PREVIEW_SIZE`` (1/2 to 1/8), so
+        feature extraction never pays for a full-resolution decode.
+        
+        Decoders are tried fastest first: libjpeg-turbo (PyTurboJPEG) for
+        JPEG and OpenCV for PNG when installed, otherwise Pillow.
+        
+        Args:
+            image_bytes: Image data as bytes (JPEG/PNG)
+            image_format: Format already detected by the caller ("JPEG" or
+                "PNG"), or None to detect it from the data
+            
+        Returns:
+            Tuple of (uint8 RGB array of shape (height, width, 3), original
+            (width, height) of the image)
+            
+        Raises:
+            ValueError: If image is invalid
+        """
+        # A known format skips probing the other Pillow decoders
+        formats = (image_format,) if image_format in self._ALLOWED_FORMATS else None
+        try:
+            image = Image.open(BytesIO(image_bytes), formats=formats)
+            self._validate_image(image)
+            
+            # Reduced-scale decoding changes the pixel dimensions, so keep the
+            # original size for the analysis
+            size = image.size
+            if image.format == "JPEG":
+                return self._decode_jpeg(image_bytes, image), size
+            return self._decode_png(image_bytes, image), size
+        except OSError as e:
+            # Unidentified, truncated or corrupt image data
+            raise ValueError(f"Invalid image data: {e}") from e
+    
+    def _decode_jpeg(self, image_bytes: bytes, image: Image.Image) -> np.ndarray:
+        """
+        Decode a validated JPEG at preview scale.
+        
+        Tries libjpeg-turbo first and falls back to Pillow's draft mode if
+        it is unavailable or rejects the data.
+        
+        Args:
+            image_bytes: JPEG data as bytes
+            image: PIL Image opened from image_bytes (header only)
+            
+        Returns:
+            RGB pixel array scaled down towards _PREVIEW_SIZE
+        """
+        if self._turbojpeg is not None:
+            # Largest DCT scaling that still covers the preview size
+            width, height = image.size
+            preview_w, preview_h = self._PREVIEW_SIZE
+            scaling_factor = next(
+                ((1, d) for d in (8, 4, 2) if width // d >= preview_w and height // d >= preview_h),
+                None,
+            )
+            try:
+                return self._turbojpeg.decode(
+                    image_bytes, pixel_format=TJPF_RGB, scaling_factor=scaling_factor
+                )
+            except (OSError, RuntimeError):
+                pass
+        
+        image.draft("RGB", self._PREVIEW_SIZE)
+        return _to_rgb_array(image)
+    
+    def _decode_png(self, image_bytes: bytes, image: Image.Image) -> np.ndarray:
+        """
+        Decode a validated PNG.
+        
+        Tries OpenCV first and falls back to Pillow if it is unavailable or
+        rejects the data.
+        
+        Args:
+            image_bytes: PNG data as bytes
+            image: PIL Image opened from image_bytes (header only)
+            
+        Returns:
+            RGB pixel array
+        """
+        if cv2 is not None:
+            bgr = cv2.imdecode(np.frombuffer(image_bytes, np.uint8), cv2.IMREAD_COLOR)
+            if bgr is not None:
+                return cv2.cvtColor(bgr, cv2.COLOR_BGR2RGB)
+        
+        return _to_rgb_array(image)
+    
+    def _run_analysis(
+        self,
+        pixels: np.ndarray,
+        size: Tuple[int, int],
+        image_id: str,
+        gps: GPSCoordinates,
+        timestamp: datetime,
+        start_time: float,
+    ) -> VisionAnalysisResponse:
+        """
+        Run the analysis pipeline on a validated, decoded image.
+        
+        Args:
+            pixels: RGB pixel array (possibly at reduced scale)
+            size: Original (width, height) of the image
+            image_id: Unique identifier for the image
+            gps: GPS coordinates where image was captured
+            timestamp: Timestamp when image was captured
+            start_time: time.time() when the request started
             
         Returns:
             VisionAnalysisResponse with analysis results
         """
-        image = Image.open(BytesIO(image_bytes))
-        return self.analyze_image(image, image_id, gps, timestamp)
+        # Generate mock analysis results
+        analysis = self._run_mock_pipeline(pixels, size, gps)
+        
+        # Calculate processing time
+        processing_time_ms = (time.time() - start_time) * 1000
+        
+        return self._build_response(image_id, gps, timestamp, analysis, processing_time_ms)
+    
+    def analyze_image_batch(
+        self,
+        images: Sequence[np.ndarray],
+        sizes: Sequence[Tuple[int, int]],
+        image_ids: Sequence[str],
+        gps: GPSCoordinates,
+        timestamp: datetime,
+        decode_time_ms: float = 0.0,
+    ) -> List[VisionAnalysisResponse]:
+        """
+        Analyze a batch of decoded images captured at the same location.
+        
+        The batch runs as one pipeline pass; each result reports the batch
+        processing time (decoding included, as for analyze_image_bytes)
+        divided evenly across its images.
+        
+        Args:
+            images: RGB pixel arrays (e.g. from decode_image_bytes)
+            sizes: Original (width, height) of each image
+            image_ids: Unique identifier for each image
+            gps: GPS coordinates where the images were captured
+            timestamp: Timestamp when the images were captured
+            decode_time_ms: Wall time the caller spent decoding the batch,
+                in milliseconds
+            
+        Returns:
+            List of VisionAnalysisResponse, in the same order as images
+            
+        Raises:
+            ValueError: If images, sizes and image_ids differ in length
+        """
+        start_time = time.time()
+        
+        if not len(images) == len(sizes) == len(image_ids):
+            raise ValueError(
+                f"Batch length mismatch: {len(images)} images, {len(sizes)} sizes, "
+                f"{len(image_ids)} image IDs."
+            )
+        
+        analyses = [self._run_mock_pipeline(pixels, size, gps) for pixels, size in zip(images, sizes)]
+        
+        # Amortize the batch time over its images
+        batch_time_ms = decode_time_ms + (time.time() - start_time) * 1000
+        processing_time_ms = batch_time_ms / max(len(analyses), 1)
+        
+        return [
+            self._build_response(image_id, gps, timestamp, analysis, processing_time_ms)
+            for image_id, analysis in zip(image_ids, analyses)
+        ]
+    
+    def _build_response(
+        self,
+        image_id: str,
+        gps: GPSCoordinates,
+        timestamp: datetime,
+        analysis: Tuple[MaturityAnalysis, List[PestDetection], List[DiseaseDetection]],
+        processing_time_ms: float,
+    ) -> VisionAnalysisResponse:
+        """
+        Assemble the response for one analyzed image.
+        
+        Args:
+            image_id: Unique identifier for the image
+            gps: GPS coordinates where image was captured
+            timestamp: Timestamp when image was captured
+            analysis: Tuple of (maturity analysis, detected pests, detected diseases)
+            processing_time_ms: Processing time in milliseconds
+            
+        Returns:
+            VisionAnalysisResponse with analysis results
+        """
+        maturity, pests, diseases = analysis
+        
+        # Results are generated here from validated inputs, so skip
+        # re-running the Pydantic validators (trusted-source fast path)
+        return VisionAnalysisResponse.model_construct(
+            image_id=image_id,
+            gps=gps,
+            timestamp=timestamp,
+            maturity=maturity,
+            pests=pests,
+            diseases=diseases,
+            processing_time_ms=processing_time_ms,
+            model_version=self.model_version,
+        )
     
     def _validate_image(self, image: Image.Image) -> None:
         """
@@ -111,143 +420,137 @@ class VisionAnalyzer:
             ValueError: If image is invalid
         """
         # Check format
-        if image.format not in ('JPEG', 'PNG'):
+        if image.format not in self._ALLOWED_FORMATS:
             raise ValueError(f"Unsupported image format: {image.format}. Use JPEG or PNG.")
         
-        # Check dimensions
-        width, height = image.size
-        if width < 224 or height < 224:
-            raise ValueError(f"Image too small: {width}x{height}. Minimum 224x224 pixels.")
+        self._validate_size(*image.size)
+    
+    def _validate_size(self, width: int, height: int) -> None:
+        """
+        Validate image dimensions.
         
-        if width > 4096 or height > 4096:
-            raise ValueError(f"Image too large: {width}x{height}. Maximum 4096x4096 pixels.")
+        Args:
+            width: Image width in pixels
+            height: Image height in pixels
+            
+        Raises:
+            ValueError: If image is too small or too large
+        """
+        # Single comparison on the common, valid path
+        lo, hi = self._MIN_SIZE, self._MAX_SIZE
+        if not (lo <= width <= hi and lo <= height <= hi):
+            if width < lo or height < lo:
+                raise ValueError(f"Image too small: {width}x{height}. Minimum {lo}x{lo} pixels.")
+            raise ValueError(f"Image too large: {width}x{height}. Maximum {hi}x{hi} pixels.")
     
-    def _analyze_maturity(
+    def _run_mock_pipeline(
         self,
-        image: Image.Image,
-        gps: GPSCoordinates
-    ) -> MaturityAnalysis:
+        pixels: np.ndarray,
+        size: Tuple[int, int],
+        gps: GPSCoordinates,
+    ) -> Tuple[MaturityAnalysis, List[PestDetection], List[DiseaseDetection]]:
         """
-        Analyze sugarcane maturity (placeholder - returns mock data).
+        Run maturity, pest and disease analysis (placeholder - returns mock data).
+        
+        The variates needed on every call (maturity and the pest/disease
+        triggers) are drawn in one call from a single generator seeded with
+        the image characteristics, so results are consistent for the same
+        inputs. The rare detections draw theirs only when triggered.
         
         In production, this would:
         1. Extract visual features (color histograms, texture)
-        2. Run through trained CNN model
-        3. Correlate with GPS location (elevation, climate zone)
-        4. Return calibrated maturity prediction
+        2. Run through trained CNN model for maturity, correlated with
+           GPS location (elevation, climate zone)
+        3. Use an object detection model (e.g., YOLOv8, Faster R-CNN)
+           trained on pest images
+        4. Use a classification model trained on disease symptoms
         
         Args:
-            image: PIL Image object
+            pixels: RGB pixel array (possibly at reduced scale)
+            size: Original (width, height) of the image
             gps: GPS coordinates
             
         Returns:
-            MaturityAnalysis with mock results
+            Tuple of (maturity analysis, detected pests, detected diseases);
+            the detection lists are usually empty in mock mode
         """
-        # Seed random with image characteristics for consistency
-        width, height = image.size
+        # Seed a per-call generator with image characteristics for consistency
+        # (no shared global state between concurrent requests)
+        width, height = size
         seed = int((gps.lat + gps.lon) * 1000) + width + height
-        random.seed(seed)
-        
-        # Generate mock maturity analysis
-        maturity_levels = [
-            ("immature", 10.5, 12.0, 14.0),
-            ("early_maturity", 12.5, 14.5, 16.0),
-            ("ready_to_harvest", 14.0, 16.5, 18.5),
-            ("late_harvest", 13.5, 15.8, 17.8),
-            ("overripe", 12.0, 14.0, 16.5),
-        ]
+        rng = np.random.default_rng(seed & 0xFFFFFFFF)
+        u = rng.random(7)
         
-        # Weighted selection (favor ready_to_harvest)
-        weights = [0.1, 0.15, 0.5, 0.15, 0.1]
-        level, atr, pol, brix = random.choices(maturity_levels, weights=weights)[0]
+        # Generate mock maturity analysis (weighted selection)
+        idx = min(int(np.searchsorted(self._CUM_WEIGHTS, u[0], side="right")), len(self._LEVELS) - 1)
+        level, atr, pol, brix = self._LEVELS[idx]
         
         # Add some variation
-        atr += random.uniform(-0.5, 0.5)
-        pol += random.uniform(-0.5, 0.5)
-        brix += random.uniform(-0.5, 0.5)
-        confidence = random.uniform(0.75, 0.95)
+        d_atr, d_pol, d_brix = u[1:4] - 0.5
+        confidence = 0.75 + 0.2 * u[4]
         
-        return MaturityAnalysis(
+        maturity = MaturityAnalysis.model_construct(
             level=level,
-            confidence=round(confidence, 3),
-            estimated_atr=round(atr, 1),
-            estimated_pol=round(pol, 1),
-            estimated_brix=round(brix, 1),
+            confidence=float(confidence),
+            estimated_atr=float(atr + d_atr),
+            estimated_pol=float(pol + d_pol),
+            estimated_brix=float(brix + d_brix),
         )
+        
+        # 10% chance of detecting a pest, 5% chance of detecting a disease;
+        # the common no-detection path allocates nothing further
+        pests = [] if u[5] <= 0.9 else self._build_pests(rng)
+        diseases = [] if u[6] <= 0.95 else self._build_diseases(rng)
+        
+        return maturity, pests, diseases
     
-    def _detect_pests(self, image: Image.Image) -> List[PestDetection]:
+    def _build_pests(self, rng: np.random.Generator) -> List[PestDetection]:
         """
-        Detect pests in sugarcane (placeholder - returns mock data).
-        
-        In production, this would use an object detection model
-        (e.g., YOLOv8, Faster R-CNN) trained on pest images.
+        Build a mock pest detection (rare path of _run_mock_pipeline).
         
         Args:
-            image: PIL Image object
+            rng: Generator seeded by _run_mock_pipeline
             
         Returns:
-            List of detected pests (usually empty in mock mode)
-        """
-        # 10% chance of detecting a pest
-        if random.random() > 0.9:
-            pest_types = [
-                ("sugarcane_borer", "moderate"),
-                ("spittlebug", "low"),
-                ("white_grub", "moderate"),
-                ("aphid", "low"),
-            ]
-            pest_type, severity = random.choice(pest_types)
-            
-            # Generate random bounding box
-            x1 = random.uniform(0.1, 0.5)
-            y1 = random.uniform(0.1, 0.5)
-            x2 = x1 + random.uniform(0.1, 0.3)
-            y2 = y1 + random.uniform(0.1, 0.3)
-            
-            return [
-                PestDetection(
-                    pest_type=pest_type,
-                    confidence=round(random.uniform(0.7, 0.9), 3),
-                    severity=severity,
-                    bounding_box=[x1, y1, x2, y2],
-                )
-            ]
+            List with one detected pest
+        """
+        u = rng.random(6)
+        pest_type, severity = self._PEST_TYPES[int(u[0] * len(self._PEST_TYPES))]
         
-        return []
+        # Generate random bounding box
+        x1, y1 = 0.1 + 0.4 * u[1:3]
+        w, h = 0.1 + 0.2 * u[3:5]
+        
+        return [
+            PestDetection.model_construct(
+                pest_type=pest_type,
+                confidence=float(0.7 + 0.2 * u[5]),
+                severity=severity,
+                bounding_box=[float(x1), float(y1), float(x1 + w), float(y1 + h)],
+            )
+        ]
     
-    def _detect_diseases(self, image: Image.Image) -> List[DiseaseDetection]:
+    def _build_diseases(self, rng: np.random.Generator) -> List[DiseaseDetection]:
         """
-        Detect diseases in sugarcane (placeholder - returns mock data).
-        
-        In production, this would use a classification model
-        trained on disease symptoms.
+        Build a mock disease detection (rare path of _run_mock_pipeline).
         
         Args:
-            image: PIL Image object
+            rng: Generator seeded by _run_mock_pipeline
             
         Returns:
-            List of detected diseases (usually empty in mock mode)
-        """
-        # 5% chance of detecting a disease
-        if random.random() > 0.95:
-            disease_types = [
-                ("red_rot", "high"),
-                ("smut", "moderate"),
-                ("rust", "low"),
-                ("mosaic_virus", "moderate"),
-            ]
-            disease_type, severity = random.choice(disease_types)
-            
-            return [
-                DiseaseDetection(
-                    disease_type=disease_type,
-                    confidence=round(random.uniform(0.65, 0.85), 3),
-                    severity=severity,
-                    affected_area_pct=round(random.uniform(5.0, 25.0), 1),
-                )
-            ]
+            List with one detected disease
+        """
+        u = rng.random(3)
+        disease_type, severity = self._DISEASE_TYPES[int(u[0] * len(self._DISEASE_TYPES))]
         
-        return []
+        return [
+            DiseaseDetection.model_construct(
+                disease_type=disease_type,
+                confidence=float(0.65 + 0.2 * u[1]),
+                severity=severity,
+                affected_area_pct=float(5.0 + 20.0 * u[2]),
+            )
+        ]
     
     def get_model_info(self) -> dict:
         """
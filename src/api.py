@@ -1,19 +1,73 @@
 """FastAPI application for AI-Vision Agriculture analysis."""
 
-from datetime import datetime
-from typing import Optional
-import uuid
+from contextlib import asynccontextmanager
+from datetime import datetime, timezone
+from typing import List, Literal, Optional, Tuple
+import asyncio
+import functools
+import hashlib
+import os
+import secrets
+import time
 
+import anyio.to_thread
+import numpy as np
+import orjson
+from cachetools import TTLCache
 from fastapi import FastAPI, File, Form, HTTPException, UploadFile, Query
-from fastapi.responses import JSONResponse
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import JSONResponse, Response
 from PIL import Image
 
 from .analyzer import VisionAnalyzer
-from .models import GPSCoordinates, VisionAnalysisResponse
+from .models import (
+    BATCH_RESPONSE_ADAPTER,
+    RESPONSE_ADAPTER,
+    GPSCoordinates,
+    VisionAnalysisResponse,
+)
+
+
+class ORJSONResponse(JSONResponse):
+    """JSON response serialized with orjson (datetimes and numpy values natively)."""
+    
+    media_type = "application/json"
+    
+    def render(self, content) -> bytes:
+        return orjson.dumps(
+            content,
+            option=orjson.OPT_NAIVE_UTC | orjson.OPT_SERIALIZE_NUMPY,
+        )
+
+
+@functools.lru_cache(maxsize=1)
+def get_analyzer() -> VisionAnalyzer:
+    """
+    Get the shared analyzer, creating it on first use.
+    
+    Deferred from import time so loading the model doesn't slow down
+    importing the app; the lifespan handler warms it before serving.
+    
+    Returns:
+        Shared VisionAnalyzer instance
+    """
+    return VisionAnalyzer(model_version="placeholder-v0.1")
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Size the analysis thread pool and load the analyzer before serving."""
+    limiter = anyio.to_thread.current_default_thread_limiter()
+    limiter.total_tokens = 2 * (os.cpu_count() or 1)
+    
+    # Load off the event loop; real model weights can take a while
+    await run_in_threadpool(get_analyzer)
+    yield
 
 
 # Initialize FastAPI app
 app = FastAPI(
+    lifespan=lifespan,
     title="AI-Vision Agriculture API",
     description="Computer vision API for sugarcane maturity analysis, pest and disease detection",
     version="0.1.0",
@@ -26,11 +80,154 @@ app = FastAPI(
     },
 )
 
-# Initialize analyzer
-analyzer = VisionAnalyzer(model_version="placeholder-v0.1")
+# Upload limits
+MAX_IMAGE_BYTES = 10 * 1024 * 1024  # 10MB
+MAX_BATCH_IMAGES = 32
+MAX_BATCH_BYTES = 50 * 1024 * 1024  # 50MB
+_READ_CHUNK_SIZE = 64 * 1024
+
+ALLOWED_CONTENT_TYPES = frozenset({"image/jpeg", "image/png"})
+
+# File signatures: (magic bytes, image format)
+_IMAGE_SIGNATURES = (
+    (b"\xff\xd8\xff", "JPEG"),
+    (b"\x89PNG\r\n\x1a\n", "PNG"),
+)
+
+
+def _sniff_format(header: bytes) -> Optional[str]:
+    """
+    Detect the image format from the leading bytes of a file.
+    
+    Args:
+        header: First bytes of the file
+        
+    Returns:
+        "JPEG" or "PNG", or None if the signature is not recognized
+    """
+    for magic, image_format in _IMAGE_SIGNATURES:
+        if header.startswith(magic):
+            return image_format
+    return None
+
+
+async def _read_upload(image: UploadFile) -> Tuple[bytes, Optional[str]]:
+    """
+    Read an uploaded image in bounded chunks.
+    
+    Fails as soon as the upload exceeds MAX_IMAGE_BYTES, or as soon as the
+    first chunk shows it is not a JPEG or PNG (whatever its declared content
+    type), without reading the rest of it into memory.
+    
+    Args:
+        image: Uploaded image file
+        
+    Returns:
+        Tuple of (image data as bytes, sniffed image format or None if the
+        upload is empty)
+        
+    Raises:
+        HTTPException: 400 if the data is not a JPEG or PNG, 413 if the
+            upload exceeds MAX_IMAGE_BYTES
+    """
+    too_large = HTTPException(
+        status_code=413,
+        detail="Image file too large. Maximum 10MB."
+    )
+    
+    # Size is known up front when the multipart parser recorded it
+    if image.size is not None and image.size > MAX_IMAGE_BYTES:
+        raise too_large
+    
+    first_chunk = await image.read(_READ_CHUNK_SIZE)
+    if not first_chunk:
+        return b"", None
+    
+    image_format = _sniff_format(first_chunk)
+    if image_format is None:
+        raise HTTPException(
+            status_code=400,
+            detail="Invalid image data: not a JPEG or PNG file."
+        )
+    
+    buffer = bytearray(first_chunk)
+    while chunk := await image.read(_READ_CHUNK_SIZE):
+        buffer += chunk
+        if len(buffer) > MAX_IMAGE_BYTES:
+            raise too_large
+    
+    # Immutable bytes, so the BytesIO in decode_image_bytes shares the data
+    # instead of copying it
+    return bytes(buffer), image_format
+
+
+# Results for recently analyzed images, so retries and duplicate frames
+# skip decoding and inference
+RESULT_CACHE: TTLCache = TTLCache(maxsize=1024, ttl=3600)
+
+
+def _parse_timestamp(timestamp: Optional[str]) -> datetime:
+    """
+    Parse an ISO 8601 capture timestamp.
+    
+    Args:
+        timestamp: ISO 8601 timestamp, or None for the current time
+        
+    Returns:
+        Parsed datetime
+        
+    Raises:
+        HTTPException: 400 if the timestamp is not valid ISO 8601
+    """
+    if not timestamp:
+        return datetime.now(timezone.utc)
+    
+    # Python 3.10's fromisoformat() rejects a trailing 'Z'; only rewrite
+    # the string when it has one
+    if timestamp[-1] == 'Z':
+        timestamp = timestamp[:-1] + '+00:00'
+    try:
+        return datetime.fromisoformat(timestamp)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Invalid timestamp format: {e}. Use ISO 8601 format."
+        )
+
+
+def _cache_key(image_bytes: bytes, gps: GPSCoordinates) -> tuple:
+    """
+    Build the result cache key for an image.
+    
+    Args:
+        image_bytes: Image data as bytes
+        gps: GPS coordinates where image was captured
+        
+    Returns:
+        Hashable key of image content digest and coordinates
+    """
+    digest = hashlib.blake2b(image_bytes, digest_size=16).digest()
+    return (digest, gps.lat, gps.lon, gps.altitude)
 
 
-@app.get("/")
+def _analysis_response(result: VisionAnalysisResponse) -> Response:
+    """
+    Serialize an analysis result to a JSON response.
+    
+    The analyzer builds results from validated inputs, so they are dumped
+    directly instead of letting FastAPI re-validate them against
+    response_model (which only documents the schema here).
+    
+    Args:
+        result: Analysis result
+        
+    Returns:
+        JSON response
+    """
+    return Response(content=RESPONSE_ADAPTER.dump_json(result), media_type="application/json")
+
+
+@app.get("/", response_class=ORJSONResponse)
 async def root():
     """Root endpoint with API information."""
     return {
@@ -39,6 +236,7 @@ async def root():
         "status": "operational",
         "endpoints": {
             "analyze": "/analyze (POST)",
+            "analyze_batch": "/analyze-batch (POST)",
             "health": "/health (GET)",
             "model_info": "/model-info (GET)",
             "docs": "/docs (GET)",
@@ -46,20 +244,20 @@ async def root():
     }
 
 
-@app.get("/health")
+@app.get("/health", response_class=ORJSONResponse)
 async def health_check():
     """Health check endpoint."""
     return {
         "status": "healthy",
-        "timestamp": datetime.utcnow().isoformat(),
-        "analyzer": analyzer.get_model_info(),
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "analyzer": get_analyzer().get_model_info(),
     }
 
 
-@app.get("/model-info")
+@app.get("/model-info", response_class=ORJSONResponse)
 async def model_info():
     """Get information about the loaded ML model."""
-    return analyzer.get_model_info()
+    return get_analyzer().get_model_info()
 
 
 @app.post(
@@ -99,7 +297,11 @@ async def analyze_image(
         None,
         description="Timestamp when image was captured (ISO 8601 format). Defaults to current time."
     ),
-) -> VisionAnalysisResponse:
+    cache_mode: Literal["on", "read_only", "off"] = Query(
+        "on",
+        description="Result cache: on (read and write), read_only, or off"
+    ),
+) -> Response:
     """
     Analyze a sugarcane field image.
     
@@ -113,37 +315,186 @@ async def analyze_image(
     - Pest detections (if any)
     - Disease detections (if any)
     - Processing time and model version
+    
+    Results are cached by image content and GPS coordinates; a cache hit
+    returns the earlier analysis with this request's image_id and timestamp.
     """
     try:
         # Validate image content type
-        if image.content_type not in ("image/jpeg", "image/png"):
+        if image.content_type not in ALLOWED_CONTENT_TYPES:
             raise HTTPException(
                 status_code=400,
                 detail=f"Invalid image format: {image.content_type}. Use JPEG or PNG."
             )
         
-        # Read image bytes
-        image_bytes = await image.read()
+        # Read image bytes (raises 400 for non-image data, 413 past the 10MB limit)
+        image_bytes, image_format = await _read_upload(image)
         if len(image_bytes) == 0:
             raise HTTPException(status_code=400, detail="Empty image file")
         
-        if len(image_bytes) > 10 * 1024 * 1024:  # 10MB limit
+        # Parse timestamp
+        parsed_timestamp = _parse_timestamp(timestamp)
+        
+        # Create GPS coordinates
+        gps = GPSCoordinates(
+            lat=lat,
+            lon=lon,
+            altitude=altitude,
+        )
+        
+        # Serve repeated images from the result cache
+        if cache_mode != "off":
+            # Hashing a multi-MB upload takes milliseconds; keep it off the
+            # event loop (hashlib releases the GIL on large buffers)
+            cache_key = await run_in_threadpool(_cache_key, image_bytes, gps)
+            cached = RESULT_CACHE.get(cache_key)
+            if cached is not None:
+                return _analysis_response(cached.model_copy(
+                    update={"image_id": image_id, "timestamp": parsed_timestamp}
+                ))
+        
+        # Analyze image in the worker thread pool so decoding and
+        # inference don't block the event loop
+        result = await run_in_threadpool(
+            get_analyzer().analyze_image_bytes,
+            image_bytes=image_bytes,
+            image_id=image_id,
+            gps=gps,
+            timestamp=parsed_timestamp,
+            image_format=image_format,
+        )
+        
+        if cache_mode == "on":
+            RESULT_CACHE[cache_key] = result
+        
+        return _analysis_response(result)
+        
+    except HTTPException:
+        # Already carries the intended status code
+        raise
+    
+    except ValueError as e:
+        # Validation errors from Pydantic or PIL
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    except Exception as e:
+        # Unexpected errors
+        raise HTTPException(
+            status_code=500,
+            detail=f"Internal server error during image analysis: {str(e)}"
+        )
+
+
+async def _decode_upload(
+    filename: Optional[str],
+    image_bytes: bytes,
+    image_format: Optional[str],
+) -> Tuple[np.ndarray, Tuple[int, int]]:
+    """
+    Decode one batch upload in the worker thread pool.
+    
+    Args:
+        filename: Uploaded file name, for error messages
+        image_bytes: Image data as bytes
+        image_format: Sniffed image format
+        
+    Returns:
+        Tuple of (RGB pixel array, original (width, height))
+        
+    Raises:
+        ValueError: If the image is invalid, prefixed with its file name
+    """
+    try:
+        return await run_in_threadpool(get_analyzer().decode_image_bytes, image_bytes, image_format)
+    except ValueError as e:
+        raise ValueError(f"{filename}: {e}") from e
+
+
+@app.post(
+    "/analyze-batch",
+    response_model=List[VisionAnalysisResponse],
+    summary="Analyze a batch of sugarcane field images",
+    description="Upload a burst of sugarcane field images captured at the same location for analysis in one pass",
+)
+async def analyze_image_batch(
+    images: List[UploadFile] = File(
+        ...,
+        description=f"Image files (JPEG or PNG, min 224x224, max 4096x4096), at most {MAX_BATCH_IMAGES}"
+    ),
+    image_ids: Optional[List[str]] = Form(
+        None,
+        description="Unique identifier for each image, in upload order. Defaults to the file names."
+    ),
+    lat: float = Form(
+        ...,
+        ge=-34.0,
+        le=-1.0,
+        description="Latitude in decimal degrees (Brazil: -34 to -1)"
+    ),
+    lon: float = Form(
+        ...,
+        ge=-74.0,
+        le=-32.0,
+        description="Longitude in decimal degrees (Brazil: -74 to -32)"
+    ),
+    altitude: Optional[float] = Form(
+        None,
+        ge=0,
+        le=3000,
+        description="Altitude in meters above sea level"
+    ),
+    timestamp: Optional[str] = Form(
+        None,
+        description="Timestamp when the images were captured (ISO 8601 format). Defaults to current time."
+    ),
+) -> Response:
+    """
+    Analyze a batch of sugarcane field images.
+    
+    Uploads are read concurrently and decoded in the worker thread pool,
+    then analyzed in a single pipeline pass. Each image is limited to 10MB
+    and the batch to 50MB in total.
+    
+    Returns:
+    - One analysis result per image, in upload order
+    """
+    try:
+        if len(images) > MAX_BATCH_IMAGES:
             raise HTTPException(
-                status_code=413,
-                detail="Image file too large. Maximum 10MB."
+                status_code=400,
+                detail=f"Too many images: {len(images)}. Maximum {MAX_BATCH_IMAGES} per batch."
+            )
+        if image_ids is not None and len(image_ids) != len(images):
+            raise HTTPException(
+                status_code=400,
+                detail=f"Got {len(image_ids)} image IDs for {len(images)} images."
             )
         
-        # Parse timestamp
-        if timestamp:
-            try:
-                parsed_timestamp = datetime.fromisoformat(timestamp.replace('Z', '+00:00'))
-            except ValueError as e:
+        # Validate image content types
+        for image in images:
+            if image.content_type not in ALLOWED_CONTENT_TYPES:
                 raise HTTPException(
                     status_code=400,
-                    detail=f"Invalid timestamp format: {e}. Use ISO 8601 format."
+                    detail=f"Invalid image format for {image.filename}: {image.content_type}. Use JPEG or PNG."
                 )
-        else:
-            parsed_timestamp = datetime.utcnow()
+        
+        batch_too_large = HTTPException(
+            status_code=413,
+            detail="Image batch too large. Maximum 50MB in total."
+        )
+        if sum(image.size or 0 for image in images) > MAX_BATCH_BYTES:
+            raise batch_too_large
+        
+        # Read image bytes
+        uploads = await asyncio.gather(*(_read_upload(image) for image in images))
+        for image, (image_bytes, _) in zip(images, uploads):
+            if len(image_bytes) == 0:
+                raise HTTPException(status_code=400, detail=f"Empty image file: {image.filename}")
+        if sum(len(image_bytes) for image_bytes, _ in uploads) > MAX_BATCH_BYTES:
+            raise batch_too_large
+        
+        # Parse timestamp
+        parsed_timestamp = _parse_timestamp(timestamp)
         
         # Create GPS coordinates
         gps = GPSCoordinates(
@@ -152,16 +503,29 @@ async def analyze_image(
             altitude=altitude,
         )
         
-        # Analyze image
-        result = analyzer.analyze_image_bytes(
-            image_bytes=image_bytes,
-            image_id=image_id,
+        # Decode concurrently in the worker thread pool (sized in lifespan)
+        decode_start = time.time()
+        decoded = await asyncio.gather(*(
+            _decode_upload(image.filename, image_bytes, image_format)
+            for image, (image_bytes, image_format) in zip(images, uploads)
+        ))
+        
+        results = await run_in_threadpool(
+            get_analyzer().analyze_image_batch,
+            images=[pixels for pixels, _ in decoded],
+            sizes=[size for _, size in decoded],
+            image_ids=image_ids or [image.filename for image in images],
             gps=gps,
             timestamp=parsed_timestamp,
+            decode_time_ms=(time.time() - decode_start) * 1000,
         )
         
-        return result
+        return Response(content=BATCH_RESPONSE_ADAPTER.dump_json(results), media_type="application/json")
         
+    except HTTPException:
+        # Already carries the intended status code
+        raise
+    
     except ValueError as e:
         # Validation errors from Pydantic or PIL
         raise HTTPException(status_code=400, detail=str(e))
@@ -177,12 +541,12 @@ async def analyze_image(
 @app.exception_handler(HTTPException)
 async def http_exception_handler(request, exc):
     """Custom exception handler for better error messages."""
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=exc.status_code,
         content={
             "error": exc.detail,
             "status_code": exc.status_code,
-            "timestamp": datetime.utcnow().isoformat(),
+            "timestamp": datetime.now(timezone.utc).isoformat(),
         },
     )
 
@@ -257,26 +621,8 @@ MOCK_SCENARIOS = {
 }
 
 
-@app.post("/api/v1/vision/analyze")
-async def analyze_mock(
-    file: Optional[UploadFile] = File(None),
-    field_id: str = Query("F001", description="Field identifier"),
-    zone_id: str = Query("Z001", description="Zone identifier"),
-    scenario: str = Query("healthy", description="Mock scenario: healthy, weeds, pests")
-):
-    """
-    Mock vision analysis endpoint for integration testing.
-    
-    Use 'scenario' parameter to control output:
-    - healthy: Optimal crop health, no issues
-    - weeds: High weed infestation
-    - pests: Heavy pest infestation + disease
-    """
-    scenario_data = MOCK_SCENARIOS.get(scenario, MOCK_SCENARIOS["healthy"])
-    
-    analysis_id = f"VIS-{datetime.utcnow().strftime('%Y%m%d%H%M%S')}-{uuid.uuid4().hex[:4].upper()}"
-    
-    # Construct recommendations based on detections
+def _build_recommendations(scenario_data: dict) -> list:
+    """Construct recommendations based on a scenario's detections."""
     recommendations = []
     if scenario_data.get("weeds"):
         recommendations.append({
@@ -304,22 +650,83 @@ async def analyze_mock(
             "reason": "Crop health is optimal"
         })
     
-    response = {
-        "analysis_id": analysis_id,
-        "timestamp": datetime.utcnow().isoformat() + "Z",
-        "source": {
-            "device_id": "DRONE-V123",
-            "device_type": "drone"
-        },
-        "location": {
-            "field_id": field_id,
-            "zone_id": zone_id
-        },
+    return recommendations
+
+
+# Scenarios are static, so the per-scenario parts of the response are built
+# once at import; requests only stamp in their ids and timestamp (read-only,
+# never mutated after this point)
+MOCK_RESPONSES = {
+    name: {
         "detections": scenario_data,
-        "recommendations": recommendations
+        "recommendations": _build_recommendations(scenario_data),
     }
+    for name, scenario_data in MOCK_SCENARIOS.items()
+}
+
+MOCK_SOURCE = {
+    "device_id": "DRONE-V123",
+    "device_type": "drone"
+}
+
+# Pre-serialized JSON for the static parts of the response: the source
+# object, and each scenario's '"detections":...,"recommendations":...}' tail
+MOCK_SOURCE_JSON = orjson.dumps(MOCK_SOURCE)
+MOCK_RESPONSE_TAILS = {
+    name: orjson.dumps(response)[1:]
+    for name, response in MOCK_RESPONSES.items()
+}
+
+
+@functools.lru_cache(maxsize=1)
+def _second_stamps(epoch_second: int) -> Tuple[str, str]:
+    """
+    Format a UTC second for mock responses, reused until the second rolls over.
+    
+    Args:
+        epoch_second: Seconds since the Unix epoch
+        
+    Returns:
+        Tuple of (compact id stamp, ISO 8601 date and time to the second)
+    """
+    t = time.gmtime(epoch_second)
+    return time.strftime("%Y%m%d%H%M%S", t), time.strftime("%Y-%m-%dT%H:%M:%S", t)
+
+
+@app.post("/api/v1/vision/analyze")
+async def analyze_mock(
+    file: Optional[UploadFile] = File(None),
+    field_id: str = Query("F001", description="Field identifier"),
+    zone_id: str = Query("Z001", description="Zone identifier"),
+    scenario: str = Query("healthy", description="Mock scenario: healthy, weeds, pests")
+) -> Response:
+    """
+    Mock vision analysis endpoint for integration testing.
     
-    return response
+    Use 'scenario' parameter to control output:
+    - healthy: Optimal crop health, no issues
+    - weeds: High weed infestation
+    - pests: Heavy pest infestation + disease
+    """
+    tail = MOCK_RESPONSE_TAILS.get(scenario, MOCK_RESPONSE_TAILS["healthy"])
+    
+    # One clock read for both the id and the timestamp
+    now_us = time.time_ns() // 1000
+    id_stamp, iso_second = _second_stamps(now_us // 1_000_000)
+    analysis_id = f"VIS-{id_stamp}-{secrets.token_hex(2).upper()}"
+    timestamp = f"{iso_second}.{now_us % 1_000_000:06d}Z"
+    
+    # Only the per-request fields are serialized; field_id and zone_id are
+    # client-supplied, so they go through orjson for escaping
+    content = b'{"analysis_id":"%s","timestamp":"%s","source":%s,"location":{"field_id":%s,"zone_id":%s},%s' % (
+        analysis_id.encode(),
+        timestamp.encode(),
+        MOCK_SOURCE_JSON,
+        orjson.dumps(field_id),
+        orjson.dumps(zone_id),
+        tail,
+    )
+    return Response(content=content, media_type="application/json")
 
 
 if __name__ == "__main__":
@@ -1,8 +1,45 @@
 """Pydantic models for AI-Vision Agriculture API data contracts."""
 
 from datetime import datetime
-from typing import List, Literal, Optional
-from pydantic import BaseModel, Field, field_validator
+from enum import Enum
+from typing import Annotated, List, Optional
+from pydantic import BaseModel, Field, PlainSerializer, TypeAdapter, field_validator
+
+
+def _rounded(ndigits: int) -> PlainSerializer:
+    """Round a float field when serializing; values are stored unrounded."""
+    return PlainSerializer(
+        lambda v: round(v, ndigits),
+        return_type=float,
+        when_used="unless-none",
+    )
+
+
+class MaturityLevel(str, Enum):
+    """Sugarcane maturity classification levels, in maturity order."""
+    
+    IMMATURE = "immature"
+    EARLY_MATURITY = "early_maturity"
+    READY_TO_HARVEST = "ready_to_harvest"
+    LATE_HARVEST = "late_harvest"
+    OVERRIPE = "overripe"
+    
+    def __str__(self) -> str:
+        """Format as the value ("immature"), not the member name."""
+        return self.value
+
+
+class Severity(str, Enum):
+    """Severity levels for pest infestations and diseases."""
+    
+    LOW = "low"
+    MODERATE = "moderate"
+    HIGH = "high"
+    CRITICAL = "critical"
+    
+    def __str__(self) -> str:
+        """Format as the value ("low"), not the member name."""
+        return self.value
 
 
 class GPSCoordinates(BaseModel):
@@ -26,70 +63,39 @@ class GPSCoordinates(BaseModel):
         le=3000,
         description="Altitude in meters above sea level"
     )
-    
-    @field_validator('lat')
-    @classmethod
-    def validate_lat(cls, v: float) -> float:
-        """Ensure latitude is within valid range."""
-        if not -34.0 <= v <= -1.0:
-            raise ValueError("Latitude must be between -34 and -1 (Brazil)")
-        return v
-    
-    @field_validator('lon')
-    @classmethod
-    def validate_lon(cls, v: float) -> float:
-        """Ensure longitude is within valid range."""
-        if not -74.0 <= v <= -32.0:
-            raise ValueError("Longitude must be between -74 and -32 (Brazil)")
-        return v
 
 
 class MaturityAnalysis(BaseModel):
     """Sugarcane maturity analysis results."""
     
-    level: Literal[
-        "immature",
-        "early_maturity",
-        "ready_to_harvest",
-        "late_harvest",
-        "overripe"
-    ] = Field(
+    level: MaturityLevel = Field(
         ...,
         description="Maturity classification level"
     )
-    confidence: float = Field(
+    confidence: Annotated[float, _rounded(3)] = Field(
         ...,
         ge=0.0,
         le=1.0,
         description="Confidence score (0-1) for maturity classification"
     )
-    estimated_atr: float = Field(
+    estimated_atr: Annotated[float, _rounded(1)] = Field(
         ...,
         ge=0.0,
         le=25.0,
         description="Estimated ATR (Total Recoverable Sugar) in kg/ton"
     )
-    estimated_pol: Optional[float] = Field(
+    estimated_pol: Annotated[Optional[float], _rounded(1)] = Field(
         None,
         ge=0.0,
         le=25.0,
         description="Estimated POL (Polarization) percentage"
     )
-    estimated_brix: Optional[float] = Field(
+    estimated_brix: Annotated[Optional[float], _rounded(1)] = Field(
         None,
         ge=0.0,
         le=30.0,
         description="Estimated Brix (dissolved solids) percentage"
     )
-    
-    @field_validator('estimated_atr')
-    @classmethod
-    def validate_atr(cls, v: float) -> float:
-        """Ensure ATR is within realistic range for sugarcane."""
-        if not 8.0 <= v <= 20.0:
-            # Warning: ATR outside typical range (8-20 kg/ton)
-            pass
-        return v
 
 
 class PestDetection(BaseModel):
@@ -99,13 +105,13 @@ class PestDetection(BaseModel):
         ...,
         description="Type of pest detected (e.g., 'sugarcane_borer', 'spittlebug')"
     )
-    confidence: float = Field(
+    confidence: Annotated[float, _rounded(3)] = Field(
         ...,
         ge=0.0,
         le=1.0,
         description="Confidence score (0-1) for pest detection"
     )
-    severity: Literal["low", "moderate", "high", "critical"] = Field(
+    severity: Severity = Field(
         ...,
         description="Severity level of pest infestation"
     )
@@ -133,17 +139,17 @@ class DiseaseDetection(BaseModel):
         ...,
         description="Type of disease detected (e.g., 'red_rot', 'smut', 'rust')"
     )
-    confidence: float = Field(
+    confidence: Annotated[float, _rounded(3)] = Field(
         ...,
         ge=0.0,
         le=1.0,
         description="Confidence score (0-1) for disease detection"
     )
-    severity: Literal["low", "moderate", "high", "critical"] = Field(
+    severity: Severity = Field(
         ...,
         description="Severity level of disease"
     )
-    affected_area_pct: Optional[float] = Field(
+    affected_area_pct: Annotated[Optional[float], _rounded(1)] = Field(
         None,
         ge=0.0,
         le=100.0,
@@ -234,3 +240,8 @@ class VisionAnalysisResponse(BaseModel):
                 "model_version": "placeholder-v0.1"
             }
         }
+
+
+# Built once at import; serialize responses straight to JSON bytes
+RESPONSE_ADAPTER = TypeAdapter(VisionAnalysisResponse)
+BATCH_RESPONSE_ADAPTER = TypeAdapter(List[VisionAnalysisResponse])
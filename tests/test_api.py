@@ -0,0 +1,272 @@
+"""Test script for the AI-Vision FastAPI endpoints with pytest."""
+
+import asyncio
+import re
+from datetime import datetime
+from io import BytesIO
+
+import orjson
+import pytest
+from fastapi.testclient import TestClient
+from PIL import Image
+from starlette.datastructures import UploadFile
+
+from src import api
+
+
+FORM = {
+    "image_id": "test_img_001.jpg",
+    "lat": "-21.1234",
+    "lon": "-47.5678",
+    "altitude": "580.0",
+    "timestamp": "2026-02-20T10:30:00Z",
+}
+
+
+def create_test_image(width: int = 640, height: int = 480, format: str = "JPEG") -> bytes:
+    """Create a test image and return as bytes."""
+    img = Image.new('RGB', (width, height), color=(34, 139, 34))
+    buffer = BytesIO()
+    img.save(buffer, format=format)
+    return buffer.getvalue()
+
+
+@pytest.fixture
+def client():
+    """Create a test client (runs the app lifespan)."""
+    with TestClient(api.app) as client:
+        yield client
+
+
+@pytest.fixture(autouse=True)
+def clear_result_cache():
+    """Start every test with an empty result cache."""
+    api.RESULT_CACHE.clear()
+    yield
+    api.RESULT_CACHE.clear()
+
+
+def post_image(client, image_bytes: bytes, content_type: str = "image/jpeg", params=None, **form):
+    """POST an image to /analyze."""
+    return client.post(
+        "/analyze",
+        files={"image": ("test.jpg", image_bytes, content_type)},
+        data={**FORM, **form},
+        params=params,
+    )
+
+
+def test_analyze_endpoint(client):
+    """Test a successful /analyze request."""
+    response = post_image(client, create_test_image())
+    
+    assert response.status_code == 200
+    data = response.json()
+    assert data["image_id"] == "test_img_001.jpg"
+    assert data["gps"] == {"lat": -21.1234, "lon": -47.5678, "altitude": 580.0}
+    assert data["timestamp"] == "2026-02-20T10:30:00Z"
+
+
+def test_analyze_client_errors_keep_status_code(client):
+    """Test that 400/413 errors raised in the handler are not turned into 500s."""
+    response = post_image(client, create_test_image(width=100, height=100))
+    assert response.status_code == 400
+    assert "Image too small" in response.json()["error"]
+    
+    response = post_image(client, b"")
+    assert response.status_code == 400
+    assert response.json()["error"] == "Empty image file"
+    
+    response = post_image(client, b"\xff\xd8\xff" + b"0" * api.MAX_IMAGE_BYTES)
+    assert response.status_code == 413
+
+
+def test_read_upload_fails_mid_read():
+    """Test that an upload of unknown size is rejected once it passes the limit."""
+    upload = UploadFile(file=BytesIO(b"\xff\xd8\xff" + b"0" * (2 * api.MAX_IMAGE_BYTES)))
+    assert upload.size is None
+    
+    with pytest.raises(api.HTTPException) as exc_info:
+        asyncio.run(api._read_upload(upload))
+    
+    assert exc_info.value.status_code == 413
+    # Stopped right after crossing the limit, not after reading everything
+    assert upload.file.tell() <= api.MAX_IMAGE_BYTES + api._READ_CHUNK_SIZE
+
+
+def test_result_cache_hit_restamps_response(client):
+    """Test that a cache hit returns the earlier analysis with the new image_id and timestamp."""
+    image_bytes = create_test_image()
+    
+    first = post_image(client, image_bytes).json()
+    assert len(api.RESULT_CACHE) == 1
+    
+    second = post_image(
+        client,
+        image_bytes,
+        image_id="test_img_002.jpg",
+        timestamp="2026-02-21T08:00:00Z",
+    ).json()
+    
+    assert second["image_id"] == "test_img_002.jpg"
+    assert second["timestamp"] == "2026-02-21T08:00:00Z"
+    assert second["maturity"] == first["maturity"]
+    # Served from the cache: same measured processing time
+    assert second["processing_time_ms"] == first["processing_time_ms"]
+
+
+def test_result_cache_modes(client, monkeypatch):
+    """Test that cache_mode=off bypasses the cache and read_only never writes it."""
+    image_bytes = create_test_image()
+    
+    # Count the requests that actually reach the analyzer
+    analyzer = api.get_analyzer()
+    calls = []
+    analyze_image_bytes = analyzer.analyze_image_bytes
+    def counting_analyze_image_bytes(**kwargs):
+        calls.append(kwargs["image_id"])
+        return analyze_image_bytes(**kwargs)
+    monkeypatch.setattr(analyzer, "analyze_image_bytes", counting_analyze_image_bytes)
+    
+    post_image(client, image_bytes, params={"cache_mode": "off"})
+    post_image(client, image_bytes, params={"cache_mode": "read_only"})
+    assert len(api.RESULT_CACHE) == 0
+    assert len(calls) == 2
+    
+    post_image(client, image_bytes)
+    assert len(api.RESULT_CACHE) == 1
+    assert len(calls) == 3
+    
+    post_image(client, image_bytes, params={"cache_mode": "read_only"})
+    assert len(calls) == 3
+    
+    post_image(client, image_bytes, params={"cache_mode": "off"})
+    assert len(calls) == 4
+    
+    response = post_image(client, image_bytes, params={"cache_mode": "always"})
+    assert response.status_code == 422
+
+
+def test_upload_magic_bytes_checked(client):
+    """Test that uploads are validated by their bytes, not the declared content type."""
+    # Non-image bytes declared as JPEG
+    response = post_image(client, b"GIF89a" + b"0" * 100, content_type="image/jpeg")
+    assert response.status_code == 400
+    assert response.json()["error"] == "Invalid image data: not a JPEG or PNG file."
+    
+    # Undeclared content type
+    response = post_image(client, create_test_image(), content_type="application/octet-stream")
+    assert response.status_code == 400
+    assert "Invalid image format" in response.json()["error"]
+    
+    # PNG bytes declared as JPEG are analyzed by what they are
+    response = post_image(client, create_test_image(format="PNG"), content_type="image/jpeg")
+    assert response.status_code == 200
+
+
+def post_batch(client, images, **form):
+    """POST (filename, image bytes) pairs to /analyze-batch."""
+    batch_form = {key: value for key, value in FORM.items() if key != "image_id"}
+    return client.post(
+        "/analyze-batch",
+        files=[("images", (filename, image_bytes, "image/jpeg")) for filename, image_bytes in images],
+        data={**batch_form, **form},
+    )
+
+
+def test_analyze_batch_endpoint(client):
+    """Test that batch results match /analyze, in upload order."""
+    images = [
+        ("frame_0.jpg", create_test_image(width=640, height=480)),
+        ("frame_1.jpg", create_test_image(width=1024, height=768)),
+    ]
+    
+    response = post_batch(client, images)
+    assert response.status_code == 200
+    results = response.json()
+    assert [result["image_id"] for result in results] == ["frame_0.jpg", "frame_1.jpg"]
+    
+    for (filename, image_bytes), result in zip(images, results):
+        single = post_image(client, image_bytes, image_id=filename).json()
+        assert result["maturity"] == single["maturity"]
+        assert result["timestamp"] == single["timestamp"]
+    
+    response = post_batch(client, images, image_ids=["a", "b"])
+    assert [result["image_id"] for result in response.json()] == ["a", "b"]
+
+
+def test_analyze_batch_errors(client, monkeypatch):
+    """Test batch size limits and per-file error reporting."""
+    image_bytes = create_test_image()
+    
+    # Too many images
+    response = post_batch(client, [("frame.jpg", image_bytes)] * (api.MAX_BATCH_IMAGES + 1))
+    assert response.status_code == 400
+    assert "Too many images" in response.json()["error"]
+    
+    # image_ids length mismatch
+    response = post_batch(client, [("frame_0.jpg", image_bytes), ("frame_1.jpg", image_bytes)], image_ids=["a"])
+    assert response.status_code == 400
+    assert response.json()["error"] == "Got 1 image IDs for 2 images."
+    
+    # Per-file errors name the offending file
+    response = post_batch(client, [
+        ("frame_0.jpg", image_bytes),
+        ("frame_1.jpg", create_test_image(width=100, height=100)),
+    ])
+    assert response.status_code == 400
+    assert response.json()["error"].startswith("frame_1.jpg: Image too small")
+    
+    # Total batch size
+    monkeypatch.setattr(api, "MAX_BATCH_BYTES", len(image_bytes) * 2)
+    response = post_batch(client, [("frame.jpg", image_bytes)] * 3)
+    assert response.status_code == 413
+    assert "Image batch too large" in response.json()["error"]
+
+
+def post_mock(client, **params):
+    """POST to the mock vision endpoint with the given query parameters."""
+    response = client.post("/api/v1/vision/analyze", params=params)
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/json"
+    return orjson.loads(response.content)
+
+
+@pytest.mark.parametrize("scenario", sorted(api.MOCK_SCENARIOS))
+def test_mock_scenarios(client, scenario):
+    """Test that each mock scenario returns its detections and recommendations."""
+    data = post_mock(client, scenario=scenario)
+    
+    assert data["detections"] == api.MOCK_RESPONSES[scenario]["detections"]
+    assert data["recommendations"] == api.MOCK_RESPONSES[scenario]["recommendations"]
+    assert data["source"] == api.MOCK_SOURCE
+    assert data["location"] == {"field_id": "F001", "zone_id": "Z001"}
+
+
+def test_mock_unknown_scenario_falls_back_to_healthy(client):
+    """Test that an unknown scenario gets the healthy response."""
+    data = post_mock(client, scenario="drought")
+    
+    assert data["detections"] == api.MOCK_RESPONSES["healthy"]["detections"]
+    assert data["recommendations"] == api.MOCK_RESPONSES["healthy"]["recommendations"]
+
+
+def test_mock_location_is_escaped(client):
+    """Test that client-supplied ids with JSON metacharacters round-trip."""
+    field_id = 'F"001\\north'
+    zone_id = 'Z"}\\u0000'
+    data = post_mock(client, field_id=field_id, zone_id=zone_id)
+    
+    assert data["location"] == {"field_id": field_id, "zone_id": zone_id}
+
+
+def test_mock_analysis_id_and_timestamp(client):
+    """Test the mock analysis_id and timestamp formats."""
+    data = post_mock(client)
+    
+    assert re.fullmatch(r"VIS-\d{14}-[0-9A-F]{4}", data["analysis_id"])
+    assert re.search(r"\.\d{6}Z$", data["timestamp"])
+    timestamp = datetime.fromisoformat(data["timestamp"].replace("Z", "+00:00"))
+    assert timestamp.tzinfo is not None
+    # The id stamp is the same second as the timestamp
+    assert data["analysis_id"][4:18] == timestamp.strftime("%Y%m%d%H%M%S")
@@ -0,0 +1,81 @@
+"""Test script for the maturity API mock's HTTP caching with pytest."""
+
+import asyncio
+from email.utils import formatdate
+
+import pytest
+from aiohttp.test_utils import TestClient, TestServer
+
+from mocks import maturity_api_mock as mock
+
+
+HARVEST_PRIORITY_URL = "/api/v1/harvest-priority"
+
+
+def get(path: str, **headers):
+    """GET a path from a fresh mock app, returning (status, headers, body)."""
+    async def request():
+        async with TestClient(TestServer(mock.create_app())) as client:
+            response = await client.get(path, headers=headers)
+            return response.status, response.headers, await response.read()
+    return asyncio.run(request())
+
+
+def http_date(timestamp: float) -> str:
+    """Format a Unix timestamp as an HTTP date."""
+    return formatdate(timestamp, usegmt=True)
+
+
+def test_cached_response_headers():
+    """Test that cached endpoints send the body with ETag and Last-Modified."""
+    body, etag = mock.HARVEST_PRIORITY_BODY
+    status, headers, content = get(HARVEST_PRIORITY_URL)
+    
+    assert status == 200
+    assert content == body
+    assert headers["ETag"] == f'"{etag}"'
+    assert headers["Last-Modified"] == http_date(mock.DATA_MTIME)
+    
+    status, headers, _ = get("/api/v1/maturity?field_id=F001")
+    assert status == 200
+    assert headers["ETag"] == f'"{mock.MATURITY_BODIES["F001"][1]}"'
+
+
+@pytest.mark.parametrize("if_none_match", [
+    '"{etag}"',
+    'W/"{etag}"',
+    '"other", "{etag}"',
+    '*',
+])
+def test_if_none_match_hit(if_none_match):
+    """Test that a matching, weak, listed or wildcard ETag returns 304."""
+    etag = mock.HARVEST_PRIORITY_BODY[1]
+    status, headers, content = get(HARVEST_PRIORITY_URL, **{"If-None-Match": if_none_match.format(etag=etag)})
+    
+    assert status == 304
+    assert content == b""
+    assert headers["ETag"] == f'"{etag}"'
+
+
+def test_if_none_match_takes_precedence():
+    """Test that a non-matching ETag returns 200 even with a fresh If-Modified-Since."""
+    status, _, content = get(HARVEST_PRIORITY_URL, **{
+        "If-None-Match": '"other"',
+        "If-Modified-Since": http_date(mock.DATA_MTIME),
+    })
+    
+    assert status == 200
+    assert content == mock.HARVEST_PRIORITY_BODY[0]
+
+
+@pytest.mark.parametrize("if_modified_since, expected_status", [
+    (http_date(mock.DATA_MTIME), 304),
+    (http_date(mock.DATA_MTIME + 60), 304),
+    (http_date(mock.DATA_MTIME - 1), 200),
+    ("not a date", 200),
+])
+def test_if_modified_since(if_modified_since, expected_status):
+    """Test If-Modified-Since at, after and before DATA_MTIME, and unparsable."""
+    status, _, _ = get(HARVEST_PRIORITY_URL, **{"If-Modified-Since": if_modified_since})
+    
+    assert status == expected_status